@@ -5,21 +5,47 @@ from __future__ import annotations
 import logging
 from datetime import timedelta
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN, CONF_API_KEY, CONF_CAMERA_ENTITY, CONF_SCAN_INTERVAL, SERVICE_READ_METER
+from .const import (
+    DOMAIN,
+    CONF_API_KEY,
+    CONF_CAMERA_ENTITY,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_PROFILE_BLOCK_THRESHOLD_MS,
+    DEFAULT_PROFILE_SAMPLE_EVERY,
+    SERVICE_READ_METER,
+    SERVICE_SET_PROFILING,
+)
 from .coordinator import ClaudeMeterReaderCoordinator
+from .escalation import async_remove_storage
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BUTTON]
 
+SET_PROFILING_SCHEMA = vol.Schema(
+    {
+        vol.Required("enabled"): cv.boolean,
+        vol.Optional("block_threshold_ms", default=DEFAULT_PROFILE_BLOCK_THRESHOLD_MS): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=10000)
+        ),
+        vol.Optional("sample_every", default=DEFAULT_PROFILE_SAMPLE_EVERY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Claude Meter Reader from a config entry."""
     coordinator = ClaudeMeterReaderCoordinator(hass, entry)
+    await coordinator.async_load_history()
     
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -35,6 +61,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     hass.services.async_register(DOMAIN, SERVICE_READ_METER, handle_read_meter)
     
+    # Register the set_profiling service
+    async def handle_set_profiling(call: ServiceCall):
+        """Handle the set_profiling service call for all loaded entries."""
+        for entry_coordinator in list(hass.data[DOMAIN].values()):
+            if call.data["enabled"]:
+                await entry_coordinator.profiler.async_start(
+                    call.data["block_threshold_ms"], call.data["sample_every"]
+                )
+            else:
+                await entry_coordinator.profiler.async_stop()
+    
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_PROFILING, handle_set_profiling, schema=SET_PROFILING_SCHEMA
+    )
+    
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -42,10 +83,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
         
         # Remove service if no more entries
         if not hass.data[DOMAIN]:
             hass.services.async_remove(DOMAIN, SERVICE_READ_METER)
+            hass.services.async_remove(DOMAIN, SERVICE_SET_PROFILING)
     
-    return unload_ok
\ No newline at end of file
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove stored reading history when the config entry is deleted."""
+    await async_remove_storage(hass, entry.entry_id)
\ No newline at end of file
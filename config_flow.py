@@ -15,15 +15,24 @@ from homeassistant.helpers import selector
 
 from .const import (
     DOMAIN,
+    CLAUDE_MODELS,
     CONF_API_KEY,
     CONF_CAMERA_ENTITY,
     CONF_CLAUDE_PROMPT,
     CONF_LED_ENTITY,
     CONF_LED_DELAY,
+    CONF_ESCALATION_MODEL,
+    CONF_MAX_JUMP,
+    CONF_PREWARM_CONNECTION,
+    CONF_PRIMARY_MODEL,
     CONF_SCAN_INTERVAL,
     DEFAULT_CLAUDE_PROMPT,
     DEFAULT_LED_ENTITY,
     DEFAULT_LED_DELAY,
+    DEFAULT_MAX_JUMP,
+    DEFAULT_MODEL,
+    DEFAULT_PREWARM_CONNECTION,
+    DEFAULT_PRIMARY_MODEL,
     DEFAULT_SCAN_INTERVAL,
 )
 
@@ -118,8 +127,13 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
+        
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input.get(CONF_PRIMARY_MODEL) == user_input.get(CONF_ESCALATION_MODEL):
+                errors[CONF_ESCALATION_MODEL] = "same_model"
+            else:
+                return self.async_create_entry(title="", data=user_input)
 
         schema = vol.Schema(
             {
@@ -141,6 +155,34 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_SCAN_INTERVAL, self.config_entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=300, max=3600)),
+                vol.Optional(
+                    CONF_PREWARM_CONNECTION,
+                    default=self.config_entry.options.get(
+                        CONF_PREWARM_CONNECTION, self.config_entry.data.get(CONF_PREWARM_CONNECTION, DEFAULT_PREWARM_CONNECTION)
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_PRIMARY_MODEL,
+                    default=self.config_entry.options.get(
+                        CONF_PRIMARY_MODEL, self.config_entry.data.get(CONF_PRIMARY_MODEL, DEFAULT_PRIMARY_MODEL)
+                    ),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=CLAUDE_MODELS, custom_value=True)
+                ),
+                vol.Optional(
+                    CONF_ESCALATION_MODEL,
+                    default=self.config_entry.options.get(
+                        CONF_ESCALATION_MODEL, self.config_entry.data.get(CONF_ESCALATION_MODEL, DEFAULT_MODEL)
+                    ),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(options=CLAUDE_MODELS, custom_value=True)
+                ),
+                vol.Optional(
+                    CONF_MAX_JUMP,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_JUMP, self.config_entry.data.get(CONF_MAX_JUMP, DEFAULT_MAX_JUMP)
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=100)),
                 vol.Optional(
                     CONF_CLAUDE_PROMPT,
                     default=self.config_entry.options.get(
@@ -153,6 +195,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         return self.async_show_form(
             step_id="init",
             data_schema=schema,
+            errors=errors,
         )
 
 class CannotConnect(HomeAssistantError):
@@ -10,15 +10,55 @@ CONF_CLAUDE_PROMPT = "claude_prompt"
 CONF_LED_ENTITY = "led_entity"
 CONF_LED_DELAY = "led_delay"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_PREWARM_CONNECTION = "prewarm_connection"
+CONF_PRIMARY_MODEL = "primary_model"
+CONF_ESCALATION_MODEL = "escalation_model"
+CONF_MAX_JUMP = "max_jump"
+
+# Claude models, günstigstes zuerst
+CLAUDE_MODELS = [
+    "claude-3-haiku-20240307",
+    "claude-3-5-sonnet-20241022",
+    "claude-3-5-sonnet-20240620",
+]
 
 # Default values
 DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+DEFAULT_PRIMARY_MODEL = "claude-3-haiku-20240307"
+DEFAULT_MAX_JUMP = 1.0  # m³ pro Abfrageintervall
 DEFAULT_LED_ENTITY = "light.wasserzahler_wasserzahler_led"
 DEFAULT_LED_DELAY = 10  # Sekunden
 DEFAULT_SCAN_INTERVAL = 3600  # 15 minutes
+DEFAULT_PREWARM_CONNECTION = True
+
+# Claude API connection
+API_URL = "https://api.anthropic.com/v1/messages"
+API_HOST_URL = "https://api.anthropic.com"
+API_CONNECT_TIMEOUT = 10  # Sekunden bis TCP/TLS steht
+API_READ_TIMEOUT = 25  # Sekunden bis zum ersten Byte / zwischen Bytes
+API_TOTAL_TIMEOUT = 45  # Sekunden für den gesamten Request
+API_KEEPALIVE_TIMEOUT = 90  # Sekunden, die eine freie Verbindung offen bleibt
+API_DNS_CACHE_TTL = 600  # Sekunden
+API_LIMIT_PER_HOST = 2
+PREWARM_LEAD_TIME = 30  # Sekunden vor dem nächsten Poll
+
+# Model escalation
+AGREEMENT_TOLERANCE = 0.015  # m³, Abweichung die noch als gleich gilt
+ESCALATION_HISTORY_SIZE = 100
+ESCALATION_ACCURACY_WINDOW = 20  # letzte überprüfte Antworten pro Modell
+ESCALATION_MIN_SAMPLES = 10  # überprüfte Antworten bevor die Genauigkeit zählt
+ESCALATION_MIN_ACCURACY = 0.8
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # Sekunden
+
+# Profiling
+DEFAULT_PROFILE_BLOCK_THRESHOLD_MS = 50
+DEFAULT_PROFILE_SAMPLE_EVERY = 5  # jede n-te Ablesung mit cProfile
+PROFILE_LAG_INTERVAL = 0.1  # Sekunden zwischen Loop-Lag-Messungen
 
 # Services
 SERVICE_READ_METER = "read_meter"
+SERVICE_SET_PROFILING = "set_profiling"
 
 # Default Claude prompt
 DEFAULT_CLAUDE_PROMPT = """Analysiere dieses Wasserzähler-Bild und lies den aktuellen Zählerstand ab.
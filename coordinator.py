@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import json
 import logging
 from datetime import timedelta
 from typing import Any
@@ -11,29 +12,64 @@ from typing import Any
 import aiohttp
 from homeassistant.components.camera import async_get_image
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import ENABLE_CLEANUP_CLOSED, SERVER_SOFTWARE
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.restore_state import async_get as async_get_restore_state
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 from datetime import datetime
 
 from .const import (
     DOMAIN,
+    API_CONNECT_TIMEOUT,
+    API_DNS_CACHE_TTL,
+    API_HOST_URL,
+    API_KEEPALIVE_TIMEOUT,
+    API_LIMIT_PER_HOST,
+    API_READ_TIMEOUT,
+    API_TOTAL_TIMEOUT,
+    API_URL,
+    CLAUDE_MODELS,
+    AGREEMENT_TOLERANCE,
     CONF_API_KEY,
     CONF_CAMERA_ENTITY,
     CONF_CLAUDE_PROMPT,
     CONF_LED_ENTITY,
     CONF_LED_DELAY,
+    CONF_ESCALATION_MODEL,
+    CONF_MAX_JUMP,
+    CONF_PREWARM_CONNECTION,
+    CONF_PRIMARY_MODEL,
     CONF_SCAN_INTERVAL,
     DEFAULT_CLAUDE_PROMPT,
     DEFAULT_LED_ENTITY,
     DEFAULT_LED_DELAY,
+    DEFAULT_MAX_JUMP,
+    DEFAULT_MODEL,
+    DEFAULT_PREWARM_CONNECTION,
+    DEFAULT_PRIMARY_MODEL,
     DEFAULT_SCAN_INTERVAL,
+    PREWARM_LEAD_TIME,
 )
+from .escalation import (
+    EscalationPolicy,
+    REASON_LOW_ACCURACY,
+    REASON_NO_REFERENCE,
+)
+from .profiler import ReadingProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fehler, bei denen die API gar nicht erreichbar ist. ConnectionTimeoutError
+# gibt es erst ab aiohttp 3.10.
+CONNECT_ERRORS: tuple[type[Exception], ...] = (aiohttp.ClientConnectorError,)
+if hasattr(aiohttp, "ConnectionTimeoutError"):
+    CONNECT_ERRORS += (aiohttp.ConnectionTimeoutError,)
+
 class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
     """My custom coordinator."""
 
@@ -46,6 +82,21 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
         self.led_entity = entry.options.get(CONF_LED_ENTITY) or entry.data.get(CONF_LED_ENTITY, DEFAULT_LED_ENTITY)
         self.led_delay = entry.options.get(CONF_LED_DELAY) or entry.data.get(CONF_LED_DELAY, DEFAULT_LED_DELAY)
         scan_interval = entry.options.get(CONF_SCAN_INTERVAL) or entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self.prewarm_connection = entry.options.get(
+            CONF_PREWARM_CONNECTION, entry.data.get(CONF_PREWARM_CONNECTION, DEFAULT_PREWARM_CONNECTION)
+        )
+        self.primary_model = entry.options.get(CONF_PRIMARY_MODEL) or entry.data.get(CONF_PRIMARY_MODEL, DEFAULT_PRIMARY_MODEL)
+        self.escalation_model = entry.options.get(CONF_ESCALATION_MODEL) or entry.data.get(CONF_ESCALATION_MODEL, DEFAULT_MODEL)
+        max_jump = entry.options.get(CONF_MAX_JUMP) or entry.data.get(CONF_MAX_JUMP, DEFAULT_MAX_JUMP)
+        self.escalation = EscalationPolicy(hass, entry.entry_id, max_jump, scan_interval)
+        self._session: aiohttp.ClientSession | None = None
+        self._unsub_prewarm: CALLBACK_TYPE | None = None
+        self._shutdown = False
+        # Eigene Session: HA schließt sie beim Beenden nicht selbst
+        self._unsub_close: CALLBACK_TYPE | None = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_handle_close
+        )
+        self.profiler = ReadingProfiler(hass)
         
         super().__init__(
             hass,
@@ -65,23 +116,143 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
         self.async_set_updated_data(data)
         return data
 
+    async def async_load_history(self) -> None:
+        """Load the escalation history, seeded with the restored sensor value."""
+        await self.escalation.async_load()
+        if self.escalation.last_value is not None:
+            return
+
+        # Nach einem Update oder ohne Speicherdatei den letzten Sensorwert als Referenz nehmen
+        entity_id = er.async_get(self.hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{DOMAIN}_water_meter"
+        )
+        if entity_id is None:
+            return
+        if (stored := async_get_restore_state(self.hass).last_states.get(entity_id)) is None:
+            return
+        try:
+            value = float(stored.state.state)
+        except ValueError:
+            return
+        self.escalation.record_reading(value, stored.state.last_updated)
+        _LOGGER.debug("Seeded reading history with restored value %s", value)
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled work and close the Claude API session."""
+        self._shutdown = True
+        await super().async_shutdown()
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        await self._async_close_session()
+        # Verzögertes Speichern darf die Datei nach dem Löschen nicht neu anlegen
+        await self.escalation.async_save()
+        await self.profiler.async_stop()
+
+    async def _async_handle_close(self, _event: Event) -> None:
+        """Close the Claude API session when Home Assistant stops."""
+        self._unsub_close = None
+        self._shutdown = True
+        await self._async_close_session()
+
+    async def _async_close_session(self) -> None:
+        """Close the Claude API session if it is open."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the long-lived session used for the Claude API."""
+        if self._shutdown:
+            # Nach dem Entladen keine neue Session mehr öffnen, sie würde nie geschlossen
+            raise UpdateFailed("Coordinator has been shut down")
+        if self._session is None or self._session.closed:
+            # Eigener Connector: Verbindung bleibt zwischen den Ablesungen offen,
+            # damit nicht jede Ablesung einen neuen TLS-Handshake braucht.
+            connector = aiohttp.TCPConnector(
+                limit_per_host=API_LIMIT_PER_HOST,
+                ttl_dns_cache=API_DNS_CACHE_TTL,
+                keepalive_timeout=API_KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=ENABLE_CLEANUP_CLOSED,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=API_TOTAL_TIMEOUT,
+                    sock_connect=API_CONNECT_TIMEOUT,
+                    sock_read=API_READ_TIMEOUT,
+                ),
+                headers={"User-Agent": SERVER_SOFTWARE},
+            )
+        return self._session
+
+    @callback
+    def _schedule_prewarm(self) -> None:
+        """Schedule a connection pre-warm shortly before the next poll."""
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+        if self._shutdown or not self.prewarm_connection or self.update_interval is None:
+            return
+
+        delay = self.update_interval.total_seconds() - PREWARM_LEAD_TIME
+        if delay <= 0:
+            return
+        self._unsub_prewarm = async_call_later(self.hass, delay, self._handle_prewarm)
+
+    @callback
+    def _handle_prewarm(self, _now: datetime) -> None:
+        """Start the pre-warm request in the background."""
+        self._unsub_prewarm = None
+        self.hass.async_create_background_task(
+            self._async_prewarm_connection(), f"{DOMAIN}_prewarm_connection"
+        )
+
+    async def _async_prewarm_connection(self) -> None:
+        """Open a connection to the Claude API so the next reading can reuse it."""
+        if self._shutdown:
+            return
+        session = self._get_session()
+        try:
+            async with session.head(API_HOST_URL, allow_redirects=False) as response:
+                await response.read()
+            _LOGGER.debug("Pre-warmed Claude API connection (HTTP %d)", response.status)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Pre-warming Claude API connection failed: %s", err)
+
     async def _read_meter_internal(self) -> dict[str, Any]:
         """Internal method to read meter."""
+        self.profiler.start_reading()
+        try:
+            return await self._read_meter()
+        finally:
+            self._schedule_prewarm()
+            await self.profiler.async_finish_reading()
+
+    async def _read_meter(self) -> dict[str, Any]:
+        """Turn on the LED, capture an image and let Claude read it."""
         try:
             # Turn on LED if configured
             if self.led_entity and self.led_entity != "":
-                await self._turn_on_led()
+                with self.profiler.stage("led_on"):
+                    await self._turn_on_led()
             
             # Get camera image
-            image_data = await self._get_camera_image()
+            with self.profiler.stage("camera"):
+                image_data = await self._get_camera_image()
             if image_data is None:
                 raise UpdateFailed("Failed to get camera image")
 
             # Encode image to base64
-            image_b64 = base64.b64encode(image_data).decode('utf-8')
+            with self.profiler.stage("encode"), self.profiler.sync_section("base64_encode"):
+                image_b64 = base64.b64encode(image_data).decode('utf-8')
             
             # Call Claude API
-            meter_value = await self._call_claude_api(image_b64)
+            with self.profiler.stage("claude_api"):
+                meter_value, model, escalation = await self._read_with_escalation(image_b64)
             
             # Turn off LED after delay (non-blocking)
             if self.led_entity and self.led_entity != "":
@@ -93,6 +264,8 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
             return {
                 "value": meter_value,
                 "status": "success",
+                "model": model,
+                "escalation": escalation,
                 "last_reading": dt_util.now().isoformat(),
             }
             
@@ -157,16 +330,73 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Error getting camera image: %s", err)
             return None
 
-    async def _call_claude_api(self, image_b64: str) -> float | None:
-        """Call Claude API to read meter value with model fallback."""
-        models_to_try = [
-            "claude-3-haiku-20240307",          # Schnell & günstig - funktioniert!
-            "claude-3-5-sonnet-20241022",       # Fallback
-            "claude-3-5-sonnet-20240620",       # Fallback
+    async def _read_with_escalation(
+        self, image_b64: str
+    ) -> tuple[float | None, str | None, str | None]:
+        """Read with the primary model, ask the stronger model only if in doubt."""
+        value, model = await self._call_claude_api(image_b64, [self.primary_model])
+
+        reason = self.escalation.escalation_reason(self.primary_model, value)
+        if reason is None:
+            result, result_model = value, model
+        else:
+            _LOGGER.info(
+                "Escalating reading (%s): %s read %s", reason, self.primary_model, value
+            )
+            # Das primäre Modell nie ein zweites Mal fragen, auch wenn es als
+            # Eskalationsmodell eingetragen ist
+            escalation_models = [
+                m for m in dict.fromkeys([self.escalation_model, *CLAUDE_MODELS])
+                if m != self.primary_model
+            ]
+            strong_value, strong_model = await self._call_claude_api(image_b64, escalation_models)
+            if strong_value is None:
+                # Ohne zweite Meinung nur übernehmen, wenn der Wert nicht unplausibel war
+                if (
+                    value is not None
+                    and reason in (REASON_NO_REFERENCE, REASON_LOW_ACCURACY)
+                    and self.escalation.plausibility_issue(value) in (None, REASON_NO_REFERENCE)
+                ):
+                    result, result_model = value, model
+                else:
+                    result, result_model = None, None
+            elif value is not None and abs(strong_value - value) <= AGREEMENT_TOLERANCE:
+                result, result_model = strong_value, strong_model
+            else:
+                result, result_model = self._pick_answer(value, strong_value, strong_model)
+
+            # Genauigkeit nur lernen, wenn es eine zweite Meinung gibt. Referenz ist
+            # das Eskalationsmodell, unabhängig davon welcher Wert übernommen wurde.
+            if value is not None and strong_value is not None:
+                self.escalation.record_comparison(self.primary_model, value, strong_value)
+
+        if result is not None:
+            self.escalation.record_reading(result, dt_util.now())
+        return result, result_model, reason
+
+    def _pick_answer(
+        self, value: float | None, strong_value: float, strong_model: str
+    ) -> tuple[float | None, str | None]:
+        """Choose between two differing answers, preferring the plausible one."""
+        candidates = [
+            (candidate, candidate_model)
+            for candidate, candidate_model in ((strong_value, strong_model), (value, self.primary_model))
+            if candidate is not None
+            and self.escalation.plausibility_issue(candidate) in (None, REASON_NO_REFERENCE)
         ]
-        
-        session = async_get_clientsession(self.hass)
-        url = "https://api.anthropic.com/v1/messages"
+        if not candidates:
+            _LOGGER.warning(
+                "Models disagree and neither value is plausible: %s read %s, %s read %s",
+                self.primary_model, value, strong_model, strong_value,
+            )
+            return None, None
+        return candidates[0]
+
+    async def _call_claude_api(
+        self, image_b64: str, models_to_try: list[str]
+    ) -> tuple[float | None, str | None]:
+        """Call Claude API to read meter value with model fallback."""
+        session = self._get_session()
         headers = {
             "Content-Type": "application/json",
             "x-api-key": self.api_key,
@@ -201,7 +431,10 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
                     ]
                 }
 
-                async with session.post(url, headers=headers, json=payload, timeout=30) as response:
+                with self.profiler.sync_section("serialize_payload"):
+                    body = json.dumps(payload)
+
+                async with session.post(API_URL, headers=headers, data=body) as response:
                     if response.status == 200:
                         data = await response.json()
                         content = data.get("content", [{}])[0].get("text", "").strip()
@@ -214,7 +447,7 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
                         try:
                             value = float(content.replace(',', '.'))
                             _LOGGER.info("Successfully read meter value: %s with model %s", value, model)
-                            return value
+                            return value, model
                         except ValueError:
                             _LOGGER.warning("Invalid number format from Claude (%s): '%s'", model, content)
                             continue
@@ -229,9 +462,13 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
                             continue
                         # Bei anderen Fehlern (z.B. 401, 403) alle Modelle abbrechen
                         elif response.status in [401, 403]:
-                            _LOGGER.error("Authentication error - check API key")
-                            break
+                            raise UpdateFailed("Authentication error - check API key")
 
+            except UpdateFailed:
+                raise
+            except CONNECT_ERRORS as err:
+                # Ohne Verbindung hilft auch kein anderes Modell
+                raise UpdateFailed(f"Cannot connect to Claude API: {err}") from err
             except asyncio.TimeoutError:
                 _LOGGER.warning("Timeout with model %s", model)
                 continue
@@ -240,4 +477,4 @@ class ClaudeMeterReaderCoordinator(DataUpdateCoordinator):
                 continue
 
         _LOGGER.error("All models failed to read meter value")
-        return None
+        return None, None
@@ -0,0 +1,128 @@
+# custom_components/claude_meter_reader/escalation.py
+"""Model escalation policy for Claude Meter Reader."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    AGREEMENT_TOLERANCE,
+    ESCALATION_ACCURACY_WINDOW,
+    ESCALATION_HISTORY_SIZE,
+    ESCALATION_MIN_SAMPLES,
+    ESCALATION_MIN_ACCURACY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+# Gründe für eine Eskalation zum stärkeren Modell
+REASON_NO_REFERENCE = "no_reference"
+REASON_LOW_CONFIDENCE = "low_confidence"
+REASON_DECREASE = "decrease"
+REASON_LARGE_JUMP = "large_jump"
+REASON_LOW_ACCURACY = "low_accuracy"
+
+class EscalationPolicy:
+    """Decide when the cheap model's answer needs a second opinion."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, max_jump: float, scan_interval: int
+    ) -> None:
+        """Initialize the policy."""
+        self.max_jump = max_jump
+        self.scan_interval = scan_interval
+        self._store = _get_store(hass, entry_id)
+        # Liste von [Zeitstempel (ISO), Wert], älteste zuerst
+        self.history: list[list[Any]] = []
+        # Pro Modell: letzte überprüfte Antworten (1 = stimmte mit dem
+        # Eskalationsmodell überein, 0 = nicht)
+        self.model_stats: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load reading history and model statistics from storage."""
+        if (data := await self._store.async_load()) is None:
+            return
+        self.history = data.get("history", [])
+        self.model_stats = {
+            model: stats
+            for model, stats in data.get("model_stats", {}).items()
+            if "outcomes" in stats
+        }
+
+    @property
+    def last_value(self) -> float | None:
+        """Return the last accepted meter value."""
+        if not self.history:
+            return None
+        return self.history[-1][1]
+
+    def accuracy(self, model: str) -> float | None:
+        """Return how often a model recently agreed with the escalation model."""
+        stats = self.model_stats.get(model)
+        if not stats or len(stats["outcomes"]) < ESCALATION_MIN_SAMPLES:
+            return None
+        return sum(stats["outcomes"]) / len(stats["outcomes"])
+
+    def escalation_reason(self, model: str, value: float | None) -> str | None:
+        """Return why the answer of the cheap model must be checked, if at all."""
+        if value is None:
+            return REASON_LOW_CONFIDENCE
+        if (accuracy := self.accuracy(model)) is not None and accuracy < ESCALATION_MIN_ACCURACY:
+            return REASON_LOW_ACCURACY
+        return self.plausibility_issue(value)
+
+    def plausibility_issue(self, value: float) -> str | None:
+        """Check a value against the previous reading and the allowed increase."""
+        if (last_value := self.last_value) is None:
+            return REASON_NO_REFERENCE
+        if value < last_value - AGREEMENT_TOLERANCE:
+            return REASON_DECREASE
+        if value - last_value > self._allowed_increase():
+            return REASON_LARGE_JUMP
+        return None
+
+    def _allowed_increase(self) -> float:
+        """Return the allowed increase, scaled by the time since the last reading."""
+        last_time = dt_util.parse_datetime(self.history[-1][0])
+        if last_time is None:
+            return self.max_jump
+        elapsed = (dt_util.now() - last_time).total_seconds()
+        return self.max_jump * max(1.0, elapsed / self.scan_interval)
+
+    def record_comparison(self, model: str, value: float, reference: float) -> None:
+        """Score a model's answer against the escalation model's answer."""
+        outcomes = self._stats(model)["outcomes"]
+        outcomes.append(int(abs(value - reference) <= AGREEMENT_TOLERANCE))
+        del outcomes[:-ESCALATION_ACCURACY_WINDOW]
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _stats(self, model: str) -> dict[str, Any]:
+        """Return the statistics of a model, creating them if needed."""
+        return self.model_stats.setdefault(model, {"outcomes": []})
+
+    def record_reading(self, value: float, timestamp: datetime) -> None:
+        """Append an accepted reading to the history."""
+        self.history.append([timestamp.isoformat(), value])
+        del self.history[:-ESCALATION_HISTORY_SIZE]
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    async def async_save(self) -> None:
+        """Write pending changes now, cancelling a delayed save."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {"history": self.history, "model_stats": self.model_stats}
+
+async def async_remove_storage(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the stored history and model statistics of a config entry."""
+    await _get_store(hass, entry_id).async_remove()
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding the escalation data of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
\ No newline at end of file
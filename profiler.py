@@ -0,0 +1,228 @@
+# custom_components/claude_meter_reader/profiler.py
+"""Opt-in profiling for the Claude Meter Reader reading path."""
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    DEFAULT_PROFILE_BLOCK_THRESHOLD_MS,
+    DEFAULT_PROFILE_SAMPLE_EVERY,
+    PROFILE_LAG_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+class ReadingProfiler:
+    """Measure stage timings, event loop lag and sampled cProfile data."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler (disabled)."""
+        self.hass = hass
+        self.enabled = False
+        self.block_threshold = DEFAULT_PROFILE_BLOCK_THRESHOLD_MS / 1000
+        self.sample_every = DEFAULT_PROFILE_SAMPLE_EVERY
+        self._started: str | None = None
+        self._lag_task: asyncio.Task | None = None
+        self._lag_max = 0.0
+        self._lag_total = 0.0
+        self._lag_samples = 0
+        self._stage_lag = 0.0
+        self._stage: str | None = None
+        self._readings = 0
+        self._stages: list[dict[str, Any]] = []
+        self._blocking: list[dict[str, Any]] = []
+        self._profile: cProfile.Profile | None = None
+        self._profile_files: list[str] = []
+
+    async def async_start(self, block_threshold_ms: float, sample_every: int) -> None:
+        """Start profiling and the event loop lag monitor."""
+        if self.enabled:
+            await self.async_stop()
+
+        self.block_threshold = block_threshold_ms / 1000
+        self.sample_every = sample_every
+        self._started = dt_util.now().isoformat()
+        self._lag_max = self._lag_total = self._stage_lag = 0.0
+        self._lag_samples = self._readings = 0
+        self._stage = None
+        self._stages = []
+        self._blocking = []
+        self._profile_files = []
+        self.enabled = True
+        self._lag_task = self.hass.async_create_background_task(
+            self._async_monitor_loop_lag(), f"{DOMAIN}_loop_lag_monitor"
+        )
+        _LOGGER.info(
+            "Profiling enabled (threshold %.0f ms, cProfile every %d reading(s))",
+            block_threshold_ms, sample_every,
+        )
+
+    async def async_stop(self) -> str | None:
+        """Stop profiling and write the summary file, returning its path."""
+        if not self.enabled:
+            return None
+
+        self.enabled = False
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile = None
+
+        summary = {
+            "started": self._started,
+            "stopped": dt_util.now().isoformat(),
+            "readings": self._readings,
+            "block_threshold_ms": self.block_threshold * 1000,
+            "loop_lag_ms": {
+                "max": round(self._lag_max * 1000, 2),
+                "mean": round(self._lag_total / self._lag_samples * 1000, 2)
+                if self._lag_samples else 0.0,
+                "samples": self._lag_samples,
+            },
+            "stages": self._stages,
+            "blocking_sections": self._blocking,
+            "cprofile_files": self._profile_files,
+        }
+        path = self._dump_path("json")
+        try:
+            await self.hass.async_add_executor_job(_write_json, path, summary)
+        except OSError as err:
+            _LOGGER.warning("Could not write profiling summary to %s: %s", path, err)
+            return None
+        _LOGGER.info("Profiling disabled, summary written to %s", path)
+        return path
+
+    def start_reading(self) -> None:
+        """Begin profiling a reading, sampling cProfile if it is due."""
+        if not self.enabled:
+            return
+
+        self._readings += 1
+        if self._profile is not None or self._readings % self.sample_every:
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Ein anderer Profiler (z.B. die HA profiler-Integration) ist aktiv
+            _LOGGER.warning("Could not start cProfile: %s", err)
+            return
+        self._profile = profile
+
+    async def async_finish_reading(self) -> None:
+        """Stop the cProfile sample of the current reading and dump it."""
+        if self._profile is None:
+            return
+
+        profile, self._profile = self._profile, None
+        profile.disable()
+        path = self._dump_path("prof")
+        try:
+            await self.hass.async_add_executor_job(profile.dump_stats, path)
+        except OSError as err:
+            # Profiling darf die Ablesung selbst nie scheitern lassen
+            _LOGGER.warning("Could not write cProfile data to %s: %s", path, err)
+            return
+        self._profile_files.append(path)
+        _LOGGER.debug("cProfile data of reading %d written to %s", self._readings, path)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time an (async) stage and record the worst loop lag seen during it."""
+        if not self.enabled:
+            yield
+            return
+
+        self._stage_lag = 0.0
+        self._stage = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stage = None
+            self._stages.append({
+                "reading": self._readings,
+                "stage": name,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "max_loop_lag_ms": round(self._stage_lag * 1000, 2),
+                # Zeiten mit aktivem cProfile sind durch dessen Overhead verfälscht
+                "cprofile": self._profile is not None,
+            })
+
+    @contextmanager
+    def sync_section(self, name: str) -> Iterator[None]:
+        """Time a synchronous section and flag it if it blocks the loop too long."""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            if self._profile is not None:
+                # Mit cProfile gemessen, zählt nicht für die Blockier-Statistik
+                _LOGGER.debug(
+                    "Section '%s' took %.1f ms under cProfile", name, duration * 1000
+                )
+            elif duration > self.block_threshold:
+                _LOGGER.warning(
+                    "Section '%s' blocked the event loop for %.1f ms", name, duration * 1000
+                )
+                self._record_blocking(name, duration)
+
+    async def _async_monitor_loop_lag(self) -> None:
+        """Measure how late the event loop wakes up a sleeping task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(PROFILE_LAG_INTERVAL)
+            lag = max(loop.time() - start - PROFILE_LAG_INTERVAL, 0.0)
+            self._stage_lag = max(self._stage_lag, lag)
+            if self._profile is not None:
+                # cProfile bremst den ganzen Loop, diese Messungen nicht werten
+                continue
+            self._lag_samples += 1
+            self._lag_total += lag
+            self._lag_max = max(self._lag_max, lag)
+            if lag > self.block_threshold:
+                # Blockierender Code außerhalb der markierten Abschnitte,
+                # z.B. aus anderen Integrationen
+                _LOGGER.warning(
+                    "Event loop lag of %.1f ms detected (stage: %s)", lag * 1000, self._stage
+                )
+                self._record_blocking("event_loop_lag", lag)
+
+    def _record_blocking(self, section: str, duration: float) -> None:
+        """Add a blocking event to the summary."""
+        self._blocking.append({
+            "reading": self._readings,
+            "section": section,
+            "stage": self._stage,
+            "duration_ms": round(duration * 1000, 2),
+            "time": dt_util.now().isoformat(),
+        })
+
+    def _dump_path(self, extension: str) -> str:
+        """Return a timestamped file path in the HA config directory."""
+        timestamp = dt_util.now().strftime("%Y%m%d_%H%M%S_%f")
+        return self.hass.config.path(f"{DOMAIN}_profile_{timestamp}.{extension}")
+
+def _write_json(path: str, data: dict[str, Any]) -> None:
+    """Write the profiling summary (runs in the executor)."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
\ No newline at end of file
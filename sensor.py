@@ -81,6 +81,8 @@ class ClaudeMeterReaderSensor(CoordinatorEntity, RestoreEntity, SensorEntity):
         attrs = {
             "status": self.coordinator.data.get("status"),
             "last_reading": self.coordinator.data.get("last_reading"),
+            "model": self.coordinator.data.get("model"),
+            "escalation": self.coordinator.data.get("escalation"),
             "camera_entity": self.coordinator.camera_entity,
             "led_entity": self.coordinator.led_entity,
             "led_delay": self.coordinator.led_delay,